@@ -7,7 +7,7 @@ This module serves as the executable entry point when the package is installed.
 from src.cli import remove_watermark
 
 
-def cli():
+def cli() -> None:
     """
     Entry point function for the CLI application.
 
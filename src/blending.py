@@ -0,0 +1,158 @@
+"""
+Feathered mask construction and blending for watermark regions.
+
+Blends a blurred region back into the frame through a mask that fades from
+full blur at the centre to none at the edges.
+"""
+
+from typing import Callable, List, Tuple
+
+import cv2
+import numpy as np
+
+
+def create_feathered_mask(
+    width: int,
+    height: int,
+    feather_size: int = 10
+) -> np.ndarray:
+    """
+    Create a feathered mask for smooth blending at region edges.
+
+    The mask has values from 0 (no blur) at edges to 1 (full blur) at center.
+
+    Args:
+        width: Mask width in pixels
+        height: Mask height in pixels
+        feather_size: Size of the feathering transition in pixels
+
+    Returns:
+        2D numpy array with values between 0 and 1
+    """
+    if feather_size <= 0:
+        return np.ones((height, width), dtype=np.float32)
+
+    limit = min(feather_size, height, width)
+    row_ramp = _edge_ramp(height, feather_size, limit)
+    col_ramp = _edge_ramp(width, feather_size, limit)
+
+    return np.multiply.outer(row_ramp, col_ramp)
+
+
+def _edge_ramp(length: int, feather_size: int, limit: int) -> np.ndarray:
+    """
+    Build the 1-D attenuation profile applied along one mask axis.
+
+    Each of the first and last `limit` positions is scaled by its distance
+    from the edge over feather_size; where the two ramps overlap they multiply.
+
+    Args:
+        length: Number of samples along the axis
+        feather_size: Size of the feathering transition in pixels
+        limit: Number of edge positions that are attenuated
+
+    Returns:
+        float32 array of length `length` with values between 0 and 1
+    """
+    forward = np.arange(length, dtype=np.float32)
+    backward = forward[::-1]
+
+    leading = np.where(forward < limit, forward / feather_size, 1.0)
+    trailing = np.where(backward < limit, backward / feather_size, 1.0)
+
+    return (leading * trailing).astype(np.float32)
+
+
+def create_blend_masks(
+    height: int,
+    width: int,
+    feather_size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Create a broadcastable feathered mask and its complement.
+
+    The masks carry a trailing singleton channel axis so a single expression
+    blends all colour channels.
+
+    Args:
+        height: Mask height in pixels
+        width: Mask width in pixels
+        feather_size: Size of the feathering transition in pixels
+
+    Returns:
+        Tuple of (mask, 1 - mask) float32 arrays of shape (height, width, 1)
+    """
+    mask = create_feathered_mask(width, height, feather_size)[:, :, np.newaxis]
+    return mask, 1.0 - mask
+
+
+class RegionBatch:
+    """
+    Reusable buffers for blurring and blending one region across many frames.
+
+    The region of every frame in a batch is gathered into a contiguous
+    (N, height, width, 3) stack so the whole batch is blended in one call.
+    All stacks are allocated once and reused for every batch, and results
+    are written straight back into the caller's frames.
+    """
+
+    def __init__(
+        self,
+        region: Tuple[slice, slice],
+        masks: Tuple[np.ndarray, np.ndarray],
+        batch_size: int
+    ):
+        """
+        Preallocate the batch buffers for a region.
+
+        Args:
+            region: (row_slice, column_slice) of the watermark, clipped to the frame
+            masks: (mask, complement) blend masks of shape (height, width, 1)
+            batch_size: Maximum number of frames per batch
+        """
+        mask, inverse = masks
+        height, width = mask.shape[:2]
+
+        self.region = region
+        self.rois = np.empty((batch_size, height, width, 3), dtype=np.uint8)
+        self.blurred = np.empty_like(self.rois)
+        self.blended = np.empty_like(self.rois)
+        self.mask = np.tile(mask, (batch_size, 1, 1))
+        self.inverse = np.tile(inverse, (batch_size, 1, 1))
+
+    def apply(
+        self,
+        frames: List[np.ndarray],
+        blur: Callable[[np.ndarray], np.ndarray]
+    ):
+        """
+        Blur and blend the region of each frame in place.
+
+        Args:
+            frames: Frames sharing this region, at most batch_size of them
+            blur: Callable returning the blurred copy of a region
+        """
+        if self.rois[0].size == 0:
+            return
+
+        count = len(frames)
+        _, height, width, _ = self.rois.shape
+        rois = self.rois[:count]
+        blurred = self.blurred[:count]
+
+        for frame, roi, target in zip(frames, rois, blurred):
+            roi[...] = frame[self.region]
+            target[...] = blur(roi)
+
+        rows = count * height
+        blended = self.blended[:count]
+        cv2.blendLinear(
+            blurred.reshape(rows, width, 3),
+            rois.reshape(rows, width, 3),
+            self.mask[:rows],
+            self.inverse[:rows],
+            dst=blended.reshape(rows, width, 3)
+        )
+
+        for frame, result in zip(frames, blended):
+            frame[self.region] = result
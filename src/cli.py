@@ -4,57 +4,101 @@ Command-line interface for the watermark removal tool.
 Provides a user-friendly CLI with progress tracking and validation.
 """
 
+import os
+import time
+from functools import lru_cache
+
 import click
+import numpy as np
 from pathlib import Path
+from typing import Any, Optional
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn
+from rich.progress import (
+    Progress,
+    SpinnerColumn,
+    BarColumn,
+    Task,
+    TextColumn,
+    TimeElapsedColumn,
+)
 from rich.panel import Panel
 from rich.table import Table
 from rich.style import Style
-from rich.progress_bar import ProgressBar
 from rich.text import Text
 
 from src.video_analyzer import VideoAnalyzer
+from src.video_metadata import VideoMetadata
 from src.watermark_processor import WatermarkProcessor, AdvancedWatermarkProcessor
 
 
 console = Console()
 
+MAX_AUTO_WORKERS = 8
+
 
 class ShimmerTextColumn(TextColumn):
     """
     Custom text column with shimmer effect that shines through the text.
     """
 
-    def __init__(self):
+    STYLES = (
+        Style(color="white", bold=True),
+        Style(color="white"),
+        Style(color="bright_cyan"),
+        Style(color="cyan", bold=True),
+    )
+    DISTANCE_BINS = (1.5, 3.0, 4.5)
+
+    def __init__(self) -> None:
         """
         Initialize shimmer text column.
         """
         super().__init__("{task.description}")
 
-    def render(self, task):
+    def render(self, task: Task) -> Text:
         """
         Render text with animated shimmer effect.
         """
-        import time
-
         text = task.description
         shimmer_pos = (time.time() * 12) % (len(text) + 6)
 
-        result_parts = []
-        for i, char in enumerate(text):
-            distance = abs(i - shimmer_pos)
+        distances = np.abs(np.arange(len(text)) - shimmer_pos)
+        classes = np.digitize(distances, self.DISTANCE_BINS).tolist()
+
+        return Text.assemble(
+            *[(char, self.STYLES[cls]) for char, cls in zip(text, classes)]
+        )
+
+
+_BAR_CELLS = tuple(
+    Text('━', style=style)
+    for style in (
+        Style(color="white", bold=True),
+        Style(color="white"),
+        Style(color="bright_cyan"),
+        Style(color="cyan"),
+        Style(color="white", dim=True),
+    )
+)
+
+
+@lru_cache(maxsize=1024)
+def _render_shimmer_bar(bar_width: int, filled_width: int, shimmer_pos: int) -> Text:
+    """
+    Build the styled progress bar for a fill width and shimmer phase.
 
-            if distance < 1.5:
-                result_parts.append(f'[bold white]{char}[/bold white]')
-            elif distance < 3:
-                result_parts.append(f'[white]{char}[/white]')
-            elif distance < 4.5:
-                result_parts.append(f'[bright_cyan]{char}[/bright_cyan]')
-            else:
-                result_parts.append(f'[bold cyan]{char}[/bold cyan]')
+    Args:
+        bar_width: Number of bar cells
+        filled_width: Number of filled cells
+        shimmer_pos: Cell index of the shimmer highlight
+
+    Returns:
+        Styled bar text
+    """
+    classes = np.minimum(np.abs(np.arange(bar_width) - shimmer_pos), 3)
+    classes[filled_width:] = 4
 
-        return Text.from_markup(''.join(result_parts))
+    return Text.assemble(*[_BAR_CELLS[cls] for cls in classes.tolist()])
 
 
 class ShimmerBarColumn(BarColumn):
@@ -62,43 +106,29 @@ class ShimmerBarColumn(BarColumn):
     Custom progress bar with white shimmer effect.
     """
 
-    def __init__(self, *args, **kwargs):
+    FILL_BUCKETS = 20
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.bar_width = kwargs.get('bar_width', 40)
 
-    def render(self, task):
+    def render(self, task: Task) -> Text:
         """
         Render progress bar with shimmer gradient effect.
-        """
-        import time
 
+        Bars are memoized by width, fill bucket and shimmer phase, so
+        steady-state renders are cache hits.
+        """
         completed = task.completed
         total = task.total
-        percentage = (completed / total * 100) if total else 0
 
         bar_width = self.bar_width or 40
-        filled_width = int(bar_width * completed / total) if total else 0
+        filled_bucket = int(self.FILL_BUCKETS * completed / total) if total else 0
+        filled_width = bar_width * filled_bucket // self.FILL_BUCKETS
 
         shimmer_pos = int((time.time() * 10) % bar_width)
 
-        bar_parts = []
-        for i in range(bar_width):
-            if i < filled_width:
-                distance = abs(i - shimmer_pos)
-                if distance < 3:
-                    if distance == 0:
-                        bar_parts.append('[bold white]━[/bold white]')
-                    elif distance == 1:
-                        bar_parts.append('[white]━[/white]')
-                    else:
-                        bar_parts.append('[bright_cyan]━[/bright_cyan]')
-                else:
-                    bar_parts.append('[cyan]━[/cyan]')
-            else:
-                bar_parts.append('[dim white]━[/dim white]')
-
-        from rich.text import Text
-        return Text.from_markup(''.join(bar_parts))
+        return _render_shimmer_bar(bar_width, filled_width, shimmer_pos)
 
 
 @click.command()
@@ -144,16 +174,31 @@ class ShimmerBarColumn(BarColumn):
     default=51,
     help='Watermark height in pixels (default: 51)'
 )
+@click.option(
+    '--workers',
+    '-j',
+    type=click.IntRange(min=0),
+    default=1,
+    help='Number of parallel worker processes, 0 for one per CPU core up to 8 (default: 1)'
+)
+@click.option(
+    '--reencode',
+    '-r',
+    is_flag=True,
+    help='Re-encode the output video instead of stream-copying it'
+)
 def remove_watermark(
     input_video: Path,
     output_video: Path,
     blur_intensity: int,
-    preview: float,
+    preview: Optional[float],
     advanced: bool,
     info: bool,
     width: int,
-    height: int
-):
+    height: int,
+    workers: int,
+    reencode: bool
+) -> None:
     """
     Remove or blur watermarks from videos with dynamic positioning.
 
@@ -162,12 +207,14 @@ def remove_watermark(
     - Center-right
     - Bottom-left
 
-    The watermark position changes every 2.5 seconds.
+    The watermark position follows a fixed 227-frame cycle.
 
     Examples:
         watermark-remove input.mp4 output.mp4
         watermark-remove input.mp4 output.mp4 -b 75 --advanced
         watermark-remove input.mp4 output.mp4 -p 10
+        watermark-remove input.mp4 output.mp4 -j 4
+        watermark-remove input.mp4 output.mp4 -j 0
         watermark-remove input.mp4 output.mp4 --info
     """
     try:
@@ -175,58 +222,80 @@ def remove_watermark(
             console.print("[red]Error: Blur intensity must be a positive odd number[/red]")
             raise click.Abort()
 
-        with VideoAnalyzer(str(input_video)) as analyzer:
-            metadata = analyzer.analyze()
+        if workers == 0:
+            workers = min(os.cpu_count() or 1, MAX_AUTO_WORKERS)
 
+        input_path = os.fspath(input_video)
+        output_path = os.fspath(output_video)
+
+        with VideoAnalyzer(input_path) as analyzer:
             if info:
-                _display_video_info(metadata, str(input_video))
+                _display_video_info(analyzer.probe(), input_path)
                 return
 
-            _display_processing_info(
-                input_video,
-                output_video,
-                metadata,
-                blur_intensity,
-                advanced,
-                preview
-            )
+            metadata = analyzer.analyze()
+            schedule = analyzer.build_schedule(metadata)
 
-            processor_class = AdvancedWatermarkProcessor if advanced else WatermarkProcessor
+        if not output_video.parent.is_dir():
+            console.print(
+                f"[red]Error: Output directory does not exist: {output_video.parent}[/red]"
+            )
+            raise click.Abort()
 
-            processor = processor_class(
-                input_path=str(input_video),
-                output_path=str(output_video),
-                blur_intensity=blur_intensity,
-                preview_duration=preview,
-                wm_width=width,
-                wm_height=height
+        _display_processing_info(
+            input_video,
+            output_video,
+            metadata,
+            blur_intensity,
+            advanced,
+            preview
+        )
+
+        processor_class = AdvancedWatermarkProcessor if advanced else WatermarkProcessor
+
+        processor = processor_class(
+            input_path=input_path,
+            output_path=output_path,
+            blur_intensity=blur_intensity,
+            preview_duration=preview,
+            wm_width=width,
+            wm_height=height,
+            schedule=schedule,
+            workers=workers,
+            reencode=reencode
+        )
+
+        total_frames = metadata.total_frames
+        if preview:
+            total_frames = min(total_frames, int(preview * metadata.fps))
+
+        with Progress(
+            SpinnerColumn(),
+            ShimmerTextColumn(),
+            ShimmerBarColumn(bar_width=50),
+            TextColumn("[bold white]{task.percentage:>3.0f}%"),
+            TimeElapsedColumn(),
+            console=console,
+            refresh_per_second=10
+        ) as progress:
+            task = progress.add_task(
+                "Processing video...",
+                total=total_frames
             )
 
-            total_frames = metadata.total_frames
-            if preview:
-                total_frames = min(total_frames, int(preview * metadata.fps))
-
-            with Progress(
-                SpinnerColumn(),
-                ShimmerTextColumn(),
-                ShimmerBarColumn(bar_width=50),
-                TextColumn("[bold white]{task.percentage:>3.0f}%"),
-                TimeElapsedColumn(),
-                console=console,
-                refresh_per_second=10
-            ) as progress:
-                task = progress.add_task(
-                    "Processing video...",
-                    total=total_frames
-                )
-
-                def update_progress(current: int, total: int):
+            update_every = max(1, total_frames // 500)
+            last_update = 0
+
+            def update_progress(current: int, total: int) -> None:
+                nonlocal last_update
+                if current - last_update >= update_every or current == total:
                     progress.update(task, completed=current)
+                    last_update = current
 
-                processor.process(progress_callback=update_progress)
+            processor.process(progress_callback=update_progress)
 
-            console.print(f"\n[green]✓[/green] Video processed successfully!")
-            console.print(f"[dim]Output saved to: {output_video}[/dim]")
+        console.print(f"\n[green]✓[/green] Video processed successfully!")
+        console.print(f"[dim]Output saved to: {output_video}[/dim]")
 
     except ValueError as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -234,12 +303,9 @@ def remove_watermark(
     except RuntimeError as e:
         console.print(f"[red]Processing error: {e}[/red]")
         raise click.Abort()
-    except Exception as e:
-        console.print(f"[red]Unexpected error: {e}[/red]")
-        raise click.Abort()
 
 
-def _display_video_info(metadata, video_path: str):
+def _display_video_info(metadata: VideoMetadata, video_path: str) -> None:
     """
     Display detailed video information in a formatted table.
 
@@ -258,7 +324,7 @@ def _display_video_info(metadata, video_path: str):
     table.add_row("Duration", f"{metadata.duration:.2f}s ({metadata.total_frames} frames)")
     table.add_row("Codec", metadata.codec)
 
-    positions_text = "Top-left → Center-right → Bottom-left (every 2.5s)"
+    positions_text = "Top-left → Center-right → Bottom-left (227-frame cycle)"
     table.add_row("Watermark Pattern", positions_text)
 
     console.print(table)
@@ -267,11 +333,11 @@ def _display_video_info(metadata, video_path: str):
 def _display_processing_info(
     input_path: Path,
     output_path: Path,
-    metadata,
+    metadata: VideoMetadata,
     blur_intensity: int,
     advanced: bool,
-    preview: float
-):
+    preview: Optional[float]
+) -> None:
     """
     Display processing configuration before starting.
 
@@ -0,0 +1,163 @@
+"""
+Parallel segment rendering for watermark processing.
+
+Splits the processed frame range into contiguous segments, renders each one in
+its own worker process, and joins the results with an FFmpeg stream copy.
+"""
+
+import multiprocessing
+import os
+import subprocess
+import tempfile
+from typing import Callable, List, Optional, Tuple
+
+
+_frame_counter = None
+
+
+def split_frame_range(total_frames: int, segments: int) -> List[Tuple[int, int]]:
+    """
+    Split a frame range into contiguous, near-equal segments.
+
+    Args:
+        total_frames: Number of frames to split
+        segments: Desired number of segments
+
+    Returns:
+        List of (frame_start, frame_end) pairs covering [0, total_frames)
+    """
+    segments = max(1, min(segments, total_frames))
+    bounds = [total_frames * i // segments for i in range(segments + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def render_in_segments(
+    processor,
+    video_file: str,
+    workers: int,
+    progress_callback: Optional[Callable[[int, int], None]] = None
+):
+    """
+    Render a processor's frame range across worker processes.
+
+    Each worker seeks its own capture to the segment start and writes a
+    video-only segment; the segments are then concatenated without re-encoding.
+
+    Args:
+        processor: WatermarkProcessor instance providing render()
+        video_file: Path to the concatenated video-only output
+        workers: Number of worker processes
+        progress_callback: Optional callback function(current_frame, total_frames)
+
+    Raises:
+        RuntimeError: If a segment fails to render or concatenation fails
+    """
+    total_frames = processor.get_frame_count()
+    ranges = split_frame_range(total_frames, workers)
+    counter = multiprocessing.Value('q', 0)
+
+    segment_parent = os.path.dirname(os.path.abspath(video_file))
+
+    with tempfile.TemporaryDirectory(dir=segment_parent) as segment_dir:
+        segment_files = [
+            os.path.join(segment_dir, f"segment_{i:04d}.mp4")
+            for i in range(len(ranges))
+        ]
+        tasks = [
+            (processor, segment_file, frame_start, frame_end)
+            for segment_file, (frame_start, frame_end) in zip(segment_files, ranges)
+        ]
+
+        with multiprocessing.Pool(
+            len(ranges), initializer=_init_worker, initargs=(counter,)
+        ) as pool:
+            result = pool.starmap_async(_render_segment, tasks)
+
+            while not result.ready():
+                result.wait(0.1)
+                if progress_callback:
+                    progress_callback(counter.value, total_frames)
+
+            result.get()
+
+        _concat_segments(segment_files, segment_dir, video_file)
+
+
+def _init_worker(counter):
+    """
+    Store the shared frame counter in a worker process.
+
+    Args:
+        counter: Shared multiprocessing.Value counting rendered frames
+    """
+    global _frame_counter
+    _frame_counter = counter
+
+
+def _render_segment(processor, segment_file: str, frame_start: int, frame_end: int):
+    """
+    Render a single segment inside a worker process.
+
+    Progress is added to the shared counter in small batches to limit lock traffic.
+
+    Args:
+        processor: WatermarkProcessor instance providing render()
+        segment_file: Path to the segment output file
+        frame_start: First frame of the segment (inclusive)
+        frame_end: Last frame of the segment (exclusive)
+    """
+    reported = 0
+
+    def report(current: int, total: int):
+        nonlocal reported
+        if current - reported >= 16 or current == total:
+            with _frame_counter.get_lock():
+                _frame_counter.value += current - reported
+            reported = current
+
+    processor.render(segment_file, frame_start, frame_end, report)
+
+
+def _concat_entry(path: str) -> str:
+    """
+    Format a concat demuxer list entry with the path safely quoted.
+
+    Args:
+        path: Segment file path
+
+    Returns:
+        A `file '...'` line with embedded single quotes escaped
+    """
+    quoted = path.replace("'", "'\\''")
+    return f"file '{quoted}'\n"
+
+
+def _concat_segments(segment_files: List[str], work_dir: str, output_file: str):
+    """
+    Concatenate rendered segments with the FFmpeg concat demuxer.
+
+    Args:
+        segment_files: Ordered list of segment paths
+        work_dir: Directory for the concat list file
+        output_file: Path to the concatenated output
+
+    Raises:
+        RuntimeError: If FFmpeg fails
+    """
+    list_file = os.path.join(work_dir, "segments.txt")
+    with open(list_file, "w") as f:
+        f.writelines(_concat_entry(path) for path in segment_files)
+
+    ffmpeg_cmd = [
+        'ffmpeg', '-y',
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', list_file,
+        '-c', 'copy',
+        output_file
+    ]
+
+    try:
+        subprocess.run(ffmpeg_cmd, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"FFmpeg segment concat failed: {e.stderr}")
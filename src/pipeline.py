@@ -0,0 +1,182 @@
+"""
+Threaded frame pipeline for overlapping decode, processing and encode.
+
+A reader thread decodes frames into a pool of reusable buffers, the calling
+thread processes them in batches, and a writer thread encodes them. OpenCV
+releases the GIL while decoding, filtering and encoding, so the three stages
+run concurrently.
+"""
+
+import queue
+import threading
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+
+PIPELINE_DEPTH = 2
+PIPELINE_BATCH = 4
+
+_POLL_INTERVAL = 0.1
+
+
+def run_frame_pipeline(
+    cap: cv2.VideoCapture,
+    writer: cv2.VideoWriter,
+    position_indices: Sequence[int],
+    process_batch: Callable[[List[np.ndarray], int], None],
+    frame_shape: Tuple[int, int, int],
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    depth: int = PIPELINE_DEPTH,
+    batch_size: int = PIPELINE_BATCH
+):
+    """
+    Stream frames from a capture through a batch processor into a writer.
+
+    Consecutive frames that share a watermark position are grouped into
+    batches of up to batch_size frames and processed in place together.
+
+    Args:
+        cap: Opened capture positioned at the first frame to process
+        writer: Opened writer receiving processed frames in order
+        position_indices: Watermark position index for each frame to process
+        process_batch: Callable(frames, position_idx) modifying frames in place
+        frame_shape: Shape of decoded frames, used to preallocate buffers
+        progress_callback: Optional callback function(current_frame, total_frames)
+        depth: Maximum number of frames queued between stages
+        batch_size: Maximum number of frames processed per batch
+
+    Raises:
+        Exception: Any error raised by the reader, writer or process_batch
+    """
+    total_frames = len(position_indices)
+    stop = threading.Event()
+    errors: List[BaseException] = []
+
+    free_q: "queue.Queue[np.ndarray]" = queue.Queue()
+    read_q: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(maxsize=depth)
+    write_q: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(maxsize=depth)
+
+    for _ in range(2 * depth + batch_size + 2):
+        free_q.put(np.empty(frame_shape, dtype=np.uint8))
+
+    def read_frames():
+        try:
+            for _ in range(total_frames):
+                buffer = _get(free_q, stop)
+                if buffer is None or not cap.grab():
+                    break
+
+                ret, frame = cap.retrieve(buffer)
+                if not ret or not _put(read_q, frame, stop):
+                    break
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            _put(read_q, None, stop)
+
+    def write_frames():
+        try:
+            while True:
+                frame = _get(write_q, stop)
+                if frame is None:
+                    break
+
+                writer.write(frame)
+                free_q.put(frame)
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+
+    reader = threading.Thread(target=read_frames, daemon=True)
+    writer_thread = threading.Thread(target=write_frames, daemon=True)
+    reader.start()
+    writer_thread.start()
+
+    written = 0
+
+    def flush(batch: List[np.ndarray], position_idx: int) -> bool:
+        nonlocal written
+        process_batch(batch, position_idx)
+
+        for frame in batch:
+            if not _put(write_q, frame, stop):
+                return False
+
+            written += 1
+            if progress_callback:
+                progress_callback(written, total_frames)
+
+        batch.clear()
+        return True
+
+    try:
+        batch: List[np.ndarray] = []
+        batch_position = 0
+
+        for position_idx in position_indices:
+            frame = _get(read_q, stop)
+            if frame is None:
+                break
+
+            if batch and (position_idx != batch_position or len(batch) == batch_size):
+                if not flush(batch, batch_position):
+                    break
+
+            batch.append(frame)
+            batch_position = position_idx
+
+        if batch:
+            flush(batch, batch_position)
+
+        _put(write_q, None, stop)
+        writer_thread.join()
+    finally:
+        stop.set()
+        reader.join()
+        writer_thread.join()
+
+    if errors:
+        raise errors[0]
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """
+    Put an item on a bounded queue, giving up once the pipeline is stopped.
+
+    Args:
+        q: Destination queue
+        item: Item to enqueue
+        stop: Event signalling pipeline shutdown
+
+    Returns:
+        True if the item was enqueued
+    """
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    """
+    Get an item from a queue, returning None once the pipeline is stopped.
+
+    Args:
+        q: Source queue
+        stop: Event signalling pipeline shutdown
+
+    Returns:
+        The dequeued item, or None on shutdown
+    """
+    while not stop.is_set():
+        try:
+            return q.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            continue
+    return None
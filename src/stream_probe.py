@@ -0,0 +1,107 @@
+"""
+ffprobe helpers for reading video stream properties from container headers.
+
+Wraps ffmpeg-python's probe and interprets the fields the analyzer and
+processors need, such as frame rate, displayed size and codec name.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+import ffmpeg
+
+
+def probe_video(video_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Run ffprobe on the first video stream of a file.
+
+    Args:
+        video_path: Path to the video file
+
+    Returns:
+        Parsed ffprobe output, or None when ffprobe is unavailable or fails
+    """
+    try:
+        return ffmpeg.probe(video_path, select_streams="v:0")
+    except (ffmpeg.Error, OSError):
+        return None
+
+
+def probe_video_codec(video_path: str) -> str:
+    """
+    Read the codec name of a file's first video stream with ffprobe.
+
+    Args:
+        video_path: Path to the video file
+
+    Returns:
+        FFmpeg codec name such as 'h264', or an empty string if unknown
+    """
+    info = probe_video(video_path)
+    streams = (info or {}).get("streams") or []
+    return streams[0].get("codec_name", "") if streams else ""
+
+
+def parse_frame_rate(rate: str) -> float:
+    """
+    Parse an ffprobe rational frame rate such as '30000/1001'.
+
+    Args:
+        rate: Frame rate string in 'num/den' or plain numeric form
+
+    Returns:
+        Frames per second, or 0.0 when the rate is undefined
+    """
+    num, _, den = rate.partition("/")
+    try:
+        numerator = float(num)
+        denominator = float(den) if den else 1.0
+    except ValueError:
+        return 0.0
+    return numerator / denominator if denominator else 0.0
+
+
+def stream_rotation(stream: Dict[str, Any]) -> int:
+    """
+    Read the rotation applied to a video stream on display.
+
+    Newer ffprobe versions report it in the display matrix side data, older
+    ones in the 'rotate' tag.
+
+    Args:
+        stream: ffprobe stream entry
+
+    Returns:
+        Rotation in degrees, 0 when none is recorded
+    """
+    for side_data in stream.get("side_data_list") or []:
+        if "rotation" in side_data:
+            try:
+                return int(float(side_data["rotation"]))
+            except (TypeError, ValueError):
+                return 0
+
+    try:
+        return int(float((stream.get("tags") or {}).get("rotate", 0)))
+    except (TypeError, ValueError):
+        return 0
+
+
+def display_size(stream: Dict[str, Any]) -> Tuple[int, int]:
+    """
+    Compute the displayed frame size of a video stream.
+
+    ffprobe reports the coded size, so width and height are swapped for
+    streams rotated by 90 or 270 degrees, matching OpenCV's auto-orientation.
+
+    Args:
+        stream: ffprobe stream entry
+
+    Returns:
+        Tuple of (width, height) in pixels
+    """
+    width = int(stream.get("width", 0))
+    height = int(stream.get("height", 0))
+
+    if abs(stream_rotation(stream)) % 180 == 90:
+        return height, width
+    return width, height
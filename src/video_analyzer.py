@@ -3,55 +3,94 @@ Video analysis module for extracting metadata and calculating watermark position
 
 This module provides functionality to analyze video files and determine properties
 such as FPS, resolution, duration, and orientation. It also calculates the dynamic
-watermark position timeline based on a 2.3-second interval pattern.
+watermark position timeline based on a 227-frame cycle.
 """
 
-from dataclasses import dataclass
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 import cv2
-import math
+import numpy as np
 
+from src.stream_probe import display_size, parse_frame_rate, probe_video
+from src.video_metadata import VideoMetadata, WatermarkPosition
 
-@dataclass
-class VideoMetadata:
+
+CAPTURE_BUFFER_SIZE = 16
+
+
+def open_video_capture(video_path: str) -> cv2.VideoCapture:
     """
-    Container for video file metadata.
-
-    Attributes:
-        width: Video width in pixels
-        height: Video height in pixels
-        fps: Frames per second
-        total_frames: Total number of frames in video
-        duration: Video duration in seconds
-        orientation: Video orientation ('landscape', 'portrait', or 'square')
-        codec: Video codec identifier
+    Open a video with the FFmpeg backend and hardware-accelerated decode if available.
+
+    Falls back to OpenCV's default backend selection when the build lacks the
+    hardware acceleration properties or the FFmpeg backend cannot open the file.
+    Backends that support it buffer up to CAPTURE_BUFFER_SIZE decoded frames
+    ahead of the reader.
+
+    Args:
+        video_path: Path to the video file
+
+    Returns:
+        cv2.VideoCapture instance (unopened if the file cannot be read)
     """
+    try:
+        cap = cv2.VideoCapture(
+            video_path,
+            cv2.CAP_FFMPEG,
+            [
+                cv2.CAP_PROP_HW_ACCELERATION,
+                cv2.VIDEO_ACCELERATION_ANY,
+                cv2.CAP_PROP_HW_DEVICE,
+                0,
+            ],
+        )
+    except (AttributeError, TypeError, cv2.error):
+        cap = cv2.VideoCapture(video_path)
+    else:
+        if not cap.isOpened():
+            cap.release()
+            cap = cv2.VideoCapture(video_path)
 
-    width: int
-    height: int
-    fps: float
-    total_frames: int
-    duration: float
-    orientation: str
-    codec: str
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, CAPTURE_BUFFER_SIZE)
+    return cap
 
 
-@dataclass
-class WatermarkPosition:
+def seek_video_capture(
+    cap: cv2.VideoCapture, video_path: str, frame_index: int
+) -> cv2.VideoCapture:
     """
-    Defines a watermark region with coordinates and dimensions.
+    Position a capture so the next decoded frame is frame_index.
+
+    A direct seek is trusted only when the capture reports landing on the
+    requested frame. Otherwise, such as on long-GOP or variable frame rate
+    inputs, the video is reopened and decoded forward from the start.
+
+    Args:
+        cap: Opened capture
+        video_path: Path to the video file, used to reopen it
+        frame_index: Index of the next frame to read
 
-    Attributes:
-        x: X-coordinate of top-left corner
-        y: Y-coordinate of top-left corner
-        width: Width of watermark region
-        height: Height of watermark region
+    Returns:
+        Capture positioned at frame_index, possibly a new instance
+
+    Raises:
+        RuntimeError: If the video ends before frame_index
     """
+    if frame_index <= 0:
+        return cap
+
+    if (cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+            and int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == frame_index):
+        return cap
 
-    x: int
-    y: int
-    width: int
-    height: int
+    cap.release()
+    cap = open_video_capture(video_path)
+
+    for _ in range(frame_index):
+        if not cap.grab():
+            cap.release()
+            raise RuntimeError(f"Failed to seek to frame {frame_index}: {video_path}")
+
+    return cap
 
 
 class VideoAnalyzer:
@@ -61,47 +100,99 @@ class VideoAnalyzer:
 
     POSITION_COUNT = 3
     CYCLE_FRAMES = 227
+    POSITION_BOUNDARIES = (66, 146)
+    METADATA_PROPS = (
+        cv2.CAP_PROP_FRAME_WIDTH,
+        cv2.CAP_PROP_FRAME_HEIGHT,
+        cv2.CAP_PROP_FPS,
+        cv2.CAP_PROP_FRAME_COUNT,
+        cv2.CAP_PROP_FOURCC,
+    )
 
     def __init__(self, video_path: str):
         """
         Initialize analyzer with video file path.
 
+        The video capture is opened lazily on the first call to analyze().
+
         Args:
             video_path: Path to the video file to analyze
+        """
+        self.video_path = video_path
+        self.cycle_lut = self._build_cycle_lut()
+        self._positions_key: Optional[Tuple[int, int, int, int]] = None
+        self._positions_array: Optional[np.ndarray] = None
+        self.cap: Optional[cv2.VideoCapture] = None
+
+    def analyze(self) -> VideoMetadata:
+        """
+        Extract complete metadata from the video file.
+
+        Returns:
+            VideoMetadata object containing all video properties
 
         Raises:
             ValueError: If video file cannot be opened
         """
-        self.video_path = video_path
-        self.cap = cv2.VideoCapture(video_path)
+        if self.cap is None:
+            self.cap = open_video_capture(self.video_path)
 
         if not self.cap.isOpened():
-            raise ValueError(f"Cannot open video file: {video_path}")
+            raise ValueError(f"Cannot open video file: {self.video_path}")
 
-    def analyze(self) -> VideoMetadata:
+        props = {prop: self.cap.get(prop) for prop in self.METADATA_PROPS}
+
+        width = int(props[cv2.CAP_PROP_FRAME_WIDTH])
+        height = int(props[cv2.CAP_PROP_FRAME_HEIGHT])
+        fps = props[cv2.CAP_PROP_FPS]
+        total_frames = int(props[cv2.CAP_PROP_FRAME_COUNT])
+        fourcc = int(props[cv2.CAP_PROP_FOURCC])
+
+        return VideoMetadata(
+            width=width,
+            height=height,
+            fps=fps,
+            total_frames=total_frames,
+            fourcc=fourcc,
+            cycle_lut=self.cycle_lut,
+        )
+
+    def probe(self) -> VideoMetadata:
         """
-        Extract complete metadata from the video file.
+        Read metadata from container headers with ffprobe, without a decoder.
+
+        Width and height are reported as displayed, with rotation metadata
+        applied, to match analyze(). Falls back to analyze() when ffprobe is
+        unavailable or reports no video stream.
 
         Returns:
             VideoMetadata object containing all video properties
+
+        Raises:
+            ValueError: If video file cannot be opened by the fallback path
         """
-        width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        fps = self.cap.get(cv2.CAP_PROP_FPS)
-        total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        duration = total_frames / fps if fps > 0 else 0
-        codec = int(self.cap.get(cv2.CAP_PROP_FOURCC))
+        info = probe_video(self.video_path)
+        streams = (info or {}).get("streams") or []
+        if not streams:
+            return self.analyze()
+
+        stream = streams[0]
+        fps = parse_frame_rate(stream.get("avg_frame_rate", "0/0"))
+        total_frames = int(stream.get("nb_frames") or 0)
+        if total_frames <= 0:
+            duration = float(info.get("format", {}).get("duration") or 0)
+            total_frames = int(round(duration * fps))
 
-        orientation = self._determine_orientation(width, height)
+        width, height = display_size(stream)
 
         return VideoMetadata(
             width=width,
             height=height,
             fps=fps,
             total_frames=total_frames,
-            duration=duration,
-            orientation=orientation,
-            codec=self._decode_fourcc(codec),
+            fourcc=int(stream.get("codec_tag", "0x0"), 16),
+            codec_name=stream.get("codec_name", ""),
+            cycle_lut=self.cycle_lut,
         )
 
     def get_watermark_positions(
@@ -113,7 +204,7 @@ class VideoAnalyzer:
         Positions:
         - Position 0: Top-left (x=20, y=75)
         - Position 1: Center-right (x=video_width-width-10, y=592)
-        - Position 2: Bottom-left (x=32, y=video_height-195)
+        - Position 2: Bottom-left (x=25, y=video_height-260)
 
         Args:
             metadata: Video metadata containing width and height
@@ -123,7 +214,31 @@ class VideoAnalyzer:
         Returns:
             List of three WatermarkPosition objects
         """
+        positions_array = self.get_watermark_positions_array(
+            metadata, wm_width, wm_height
+        )
+        return [WatermarkPosition(*row) for row in positions_array.tolist()]
+
+    def get_watermark_positions_array(
+        self, metadata: VideoMetadata, wm_width: int = 139, wm_height: int = 51
+    ) -> np.ndarray:
+        """
+        Calculate the three watermark regions as a contiguous int32 array.
+
+        Args:
+            metadata: Video metadata containing width and height
+            wm_width: Watermark width in pixels (default: 139)
+            wm_height: Watermark height in pixels (default: 51)
+
+        Returns:
+            Array of shape (3, 4) with rows of [x, y, width, height]
+        """
         w, h = metadata.width, metadata.height
+        key = (w, h, wm_width, wm_height)
+
+        if self._positions_key == key:
+            return self._positions_array
+
         left_margin_top = 20
         left_margin_bottom = 25
         right_margin = 10
@@ -131,25 +246,54 @@ class VideoAnalyzer:
         center_y = 592
         bottom_offset = 260
 
-        positions = [
-            WatermarkPosition(
-                x=left_margin_top, y=top_offset, width=wm_width, height=wm_height
-            ),
-            WatermarkPosition(
-                x=w - wm_width - right_margin,
-                y=center_y,
-                width=wm_width,
-                height=wm_height,
-            ),
-            WatermarkPosition(
-                x=left_margin_bottom,
-                y=h - bottom_offset,
-                width=wm_width,
-                height=wm_height,
-            ),
+        self._positions_array = np.array(
+            [
+                [left_margin_top, top_offset, wm_width, wm_height],
+                [w - wm_width - right_margin, center_y, wm_width, wm_height],
+                [left_margin_bottom, h - bottom_offset, wm_width, wm_height],
+            ],
+            dtype=np.int32,
+        )
+        self._positions_key = key
+
+        return self._positions_array
+
+    def get_region_slices(
+        self, metadata: VideoMetadata, wm_width: int = 139, wm_height: int = 51
+    ) -> List[Tuple[slice, slice]]:
+        """
+        Precompute frame slices for each watermark position, clipped to the frame.
+
+        Args:
+            metadata: Video metadata containing width and height
+            wm_width: Watermark width in pixels (default: 139)
+            wm_height: Watermark height in pixels (default: 51)
+
+        Returns:
+            List of (row_slice, column_slice) pairs indexed by position
+        """
+        positions_array = self.get_watermark_positions_array(
+            metadata, wm_width, wm_height
+        )
+        return [
+            (
+                slice(max(0, y), min(y + h, metadata.height)),
+                slice(max(0, x), min(x + w, metadata.width)),
+            )
+            for x, y, w, h in positions_array.tolist()
         ]
 
-        return positions
+    def build_schedule(self, metadata: VideoMetadata) -> np.ndarray:
+        """
+        Precompute the watermark position index for every frame of the video.
+
+        Args:
+            metadata: Video metadata containing the frame count
+
+        Returns:
+            uint8 array of length total_frames holding position indices
+        """
+        return np.resize(self.cycle_lut, metadata.total_frames)
 
     def get_position_index_for_frame(self, frame_number: int, fps: float) -> int:
         """
@@ -167,54 +311,29 @@ class VideoAnalyzer:
         Returns:
             Position index (0, 1, or 2)
         """
-        cycle_frame = frame_number % self.CYCLE_FRAMES
+        return int(self.cycle_lut[frame_number % self.CYCLE_FRAMES])
 
-        if cycle_frame < 66:
-            return 0
-        elif cycle_frame < 146:
-            return 1
-        else:
-            return 2
-
-    def _determine_orientation(self, width: int, height: int) -> str:
-        """
-        Determine video orientation based on aspect ratio.
-
-        Args:
-            width: Video width in pixels
-            height: Video height in pixels
-
-        Returns:
-            Orientation string: 'landscape', 'portrait', or 'square'
-        """
-        if width > height:
-            return "landscape"
-        elif height > width:
-            return "portrait"
-        else:
-            return "square"
-
-    def _decode_fourcc(self, fourcc: int) -> str:
+    def _build_cycle_lut(self) -> np.ndarray:
         """
-        Decode FOURCC code to human-readable codec string.
-
-        Args:
-            fourcc: FOURCC integer code
+        Build the lookup table mapping each frame of the cycle to its position.
 
         Returns:
-            Codec string (e.g., 'H264', 'VP9')
+            uint8 array of length CYCLE_FRAMES holding position indices
         """
-        try:
-            return "".join([chr((fourcc >> 8 * i) & 0xFF) for i in range(4)])
-        except Exception:
-            return "UNKNOWN"
+        first, second = self.POSITION_BOUNDARIES
+        cycle_lut = np.empty(self.CYCLE_FRAMES, dtype=np.uint8)
+        cycle_lut[:first] = 0
+        cycle_lut[first:second] = 1
+        cycle_lut[second:] = 2
+        return cycle_lut
 
     def release(self):
         """
         Release video capture resources.
         """
-        if self.cap:
+        if self.cap is not None:
             self.cap.release()
+            self.cap = None
 
     def __enter__(self):
         """
@@ -0,0 +1,117 @@
+"""
+Video metadata containers shared by the analyzer and processors.
+
+Defines the metadata record produced by video analysis and the watermark
+region type, along with helpers for deriving human-readable properties.
+"""
+
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Optional
+import struct
+
+import numpy as np
+
+
+_ORIENTATIONS = ("portrait", "square", "landscape")
+
+
+def _determine_orientation(width: int, height: int) -> str:
+    """
+    Determine video orientation based on aspect ratio.
+
+    Args:
+        width: Video width in pixels
+        height: Video height in pixels
+
+    Returns:
+        Orientation string: 'landscape', 'portrait', or 'square'
+    """
+    return _ORIENTATIONS[(width > height) - (height > width) + 1]
+
+
+def _decode_fourcc(fourcc: int) -> str:
+    """
+    Decode FOURCC code to human-readable codec string.
+
+    Args:
+        fourcc: FOURCC integer code
+
+    Returns:
+        Codec string (e.g., 'H264', 'VP9')
+    """
+    try:
+        raw = struct.pack("<I", int(fourcc) & 0xFFFFFFFF)
+        return raw.decode("ascii", "replace").rstrip("\x00")
+    except (TypeError, ValueError):
+        return "UNKNOWN"
+
+
+@dataclass
+class VideoMetadata:
+    """
+    Container for video file metadata.
+
+    Derived properties are computed lazily on first access.
+
+    Attributes:
+        width: Video width in pixels
+        height: Video height in pixels
+        fps: Frames per second
+        total_frames: Total number of frames in video
+        fourcc: Raw FOURCC integer code reported by the container
+        codec_name: Decoder codec name, used when the container has no FOURCC
+        cycle_lut: Per-cycle-frame watermark position indices (uint8)
+    """
+
+    width: int
+    height: int
+    fps: float
+    total_frames: int
+    fourcc: int = 0
+    codec_name: str = ""
+    cycle_lut: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+
+    @cached_property
+    def duration(self) -> float:
+        """
+        Video duration in seconds.
+        """
+        return self.total_frames / self.fps if self.fps > 0 else 0
+
+    @cached_property
+    def orientation(self) -> str:
+        """
+        Video orientation ('landscape', 'portrait', or 'square').
+        """
+        return _determine_orientation(self.width, self.height)
+
+    @cached_property
+    def codec(self) -> str:
+        """
+        Video codec identifier.
+
+        Containers such as MKV and WebM report no FOURCC, in which case the
+        decoder codec name is used.
+        """
+        if not self.fourcc:
+            return self.codec_name
+        return _decode_fourcc(self.fourcc)
+
+
+@dataclass
+class WatermarkPosition:
+    """
+    Defines a watermark region with coordinates and dimensions.
+
+    Attributes:
+        x: X-coordinate of top-left corner
+        y: Y-coordinate of top-left corner
+        width: Width of watermark region
+        height: Height of watermark region
+    """
+
+    x: int
+    y: int
+    width: int
+    height: int
@@ -6,14 +6,25 @@ to watermark regions that change position dynamically throughout the video.
 """
 
 import cv2
+import math
 import numpy as np
 import subprocess
 import tempfile
 import os
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict, List, Tuple
 from pathlib import Path
 
-from src.video_analyzer import VideoAnalyzer, VideoMetadata, WatermarkPosition
+from src.blending import RegionBatch, create_blend_masks
+from src.gpu import CudaRegionBlur, create_cuda_blur, h264_encoder_args
+from src.parallel import render_in_segments
+from src.pipeline import PIPELINE_BATCH, run_frame_pipeline
+from src.video_analyzer import (
+    VideoAnalyzer,
+    open_video_capture,
+    seek_video_capture,
+)
+from src.stream_probe import probe_video_codec
+from src.video_metadata import VideoMetadata
 
 
 class WatermarkProcessor:
@@ -21,6 +32,10 @@ class WatermarkProcessor:
     Processes video files to blur watermarks at dynamic positions.
     """
 
+    FEATHER_SIZE = 10
+    BOX_BLUR_MIN_KERNEL = 31
+    BOX_BLUR_PASSES = 3
+
     def __init__(
         self,
         input_path: str,
@@ -28,7 +43,10 @@ class WatermarkProcessor:
         blur_intensity: int = 51,
         preview_duration: Optional[float] = None,
         wm_width: int = 139,
-        wm_height: int = 51
+        wm_height: int = 51,
+        schedule: Optional[np.ndarray] = None,
+        workers: int = 1,
+        reencode: bool = False
     ):
         """
         Initialize the watermark processor.
@@ -40,120 +58,224 @@ class WatermarkProcessor:
             preview_duration: If set, only process first N seconds
             wm_width: Watermark width in pixels
             wm_height: Watermark height in pixels
+            schedule: Optional precomputed per-frame position index schedule
+            workers: Number of worker processes rendering segments in parallel
+            reencode: Re-encode video when merging audio instead of stream-copying
 
         Raises:
-            ValueError: If blur_intensity is not a positive odd number
+            ValueError: If blur_intensity is not a positive odd number or
+                workers is less than 1
         """
         if blur_intensity <= 0 or blur_intensity % 2 == 0:
             raise ValueError("Blur intensity must be a positive odd number")
 
+        if workers < 1:
+            raise ValueError("Workers must be at least 1")
+
         self.input_path = input_path
         self.output_path = output_path
         self.blur_intensity = blur_intensity
+        self.blur_sigma = 0.3 * ((blur_intensity - 1) * 0.5 - 1) + 0.8
+        self.box_width = int(round(math.sqrt(4 * self.blur_sigma ** 2 + 1))) | 1
         self.preview_duration = preview_duration
         self.wm_width = wm_width
         self.wm_height = wm_height
+        self.schedule = schedule
+        self.workers = workers
+        self.reencode = reencode
+        self._mask_cache: Dict[Tuple[int, int, int], Tuple[np.ndarray, np.ndarray]] = {}
+        self._gpu_blur: Optional[CudaRegionBlur] = None
 
     def process(self, progress_callback: Optional[Callable[[int, int], None]] = None):
         """
         Process the video and apply blur to watermark regions.
 
-        Preserves audio from the original video.
+        Preserves audio from the original video. When more than one worker is
+        configured, the frame range is rendered in parallel segments. The
+        intermediate video is written next to the output so the final merge
+        stays on one filesystem.
 
         Args:
             progress_callback: Optional callback function(current_frame, total_frames)
 
         Raises:
-            RuntimeError: If video processing fails
+            RuntimeError: If the output directory is missing or processing fails
         """
-        temp_video = tempfile.mktemp(suffix='_video_only.mp4')
+        output_dir = os.path.dirname(os.path.abspath(self.output_path))
+        if not os.path.isdir(output_dir):
+            raise RuntimeError(f"Output directory does not exist: {output_dir}")
+
+        with tempfile.NamedTemporaryFile(
+            dir=output_dir, suffix='_video_only.mp4', delete=False
+        ) as temp_file:
+            temp_video = temp_file.name
 
         try:
-            with VideoAnalyzer(self.input_path) as analyzer:
-                metadata = analyzer.analyze()
-                positions = analyzer.get_watermark_positions(metadata, self.wm_width, self.wm_height)
+            if self.workers > 1:
+                render_in_segments(self, temp_video, self.workers, progress_callback)
+            else:
+                self.render(temp_video, progress_callback=progress_callback)
 
-                cap = cv2.VideoCapture(self.input_path)
+            self._merge_audio(temp_video, self.input_path, self.output_path)
 
-                if not cap.isOpened():
-                    raise RuntimeError(f"Failed to open video: {self.input_path}")
+        finally:
+            if os.path.exists(temp_video):
+                os.remove(temp_video)
 
-                fourcc = cv2.VideoWriter_fourcc(*'avc1')
-                out = cv2.VideoWriter(
-                    temp_video,
-                    fourcc,
-                    metadata.fps,
-                    (metadata.width, metadata.height)
-                )
+    def get_frame_count(self) -> int:
+        """
+        Count the frames that will be processed, honouring preview mode.
 
-                if not out.isOpened():
-                    cap.release()
-                    raise RuntimeError(f"Failed to create output video: {temp_video}")
+        Returns:
+            Number of frames to process
+        """
+        with VideoAnalyzer(self.input_path) as analyzer:
+            return self._frame_limit(analyzer.analyze())
+
+    def render(
+        self,
+        video_file: str,
+        frame_start: int = 0,
+        frame_end: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ):
+        """
+        Blur watermark regions for a frame range and write them without audio.
 
-                total_frames = metadata.total_frames
-                if self.preview_duration:
-                    total_frames = min(
-                        total_frames,
-                        int(self.preview_duration * metadata.fps)
-                    )
+        Args:
+            video_file: Path to the video-only output file
+            frame_start: First frame to process (inclusive)
+            frame_end: Last frame to process (exclusive), defaults to the end
+            progress_callback: Optional callback function(current_frame, total_frames)
+                reporting progress relative to the rendered range
 
-                frame_number = 0
+        Raises:
+            RuntimeError: If the input cannot be read or the output cannot be created
+        """
+        cv2.setNumThreads(self._filter_threads())
 
-                try:
-                    while frame_number < total_frames:
-                        ret, frame = cap.read()
+        with VideoAnalyzer(self.input_path) as analyzer:
+            metadata = analyzer.analyze()
+            region_slices = analyzer.get_region_slices(
+                metadata, self.wm_width, self.wm_height
+            )
+            schedule = self.schedule
+            if schedule is None:
+                schedule = analyzer.build_schedule(metadata)
 
-                        if not ret:
-                            break
+        frame_limit = self._frame_limit(metadata)
+        frame_end = frame_limit if frame_end is None else min(frame_end, frame_limit)
 
-                        position_idx = analyzer.get_position_index_for_frame(
-                            frame_number,
-                            metadata.fps
-                        )
-                        current_position = positions[position_idx]
+        cap = open_video_capture(self.input_path)
 
-                        blurred_frame = self._apply_blur_to_region(
-                            frame,
-                            current_position
-                        )
+        if not cap.isOpened():
+            raise RuntimeError(f"Failed to open video: {self.input_path}")
 
-                        out.write(blurred_frame)
+        cap = seek_video_capture(cap, self.input_path, frame_start)
 
-                        if progress_callback:
-                            progress_callback(frame_number + 1, total_frames)
+        fourcc = cv2.VideoWriter_fourcc(*'avc1')
+        out = cv2.VideoWriter(
+            video_file,
+            fourcc,
+            metadata.fps,
+            (metadata.width, metadata.height)
+        )
 
-                        frame_number += 1
+        if not out.isOpened():
+            cap.release()
+            raise RuntimeError(f"Failed to create output video: {video_file}")
+
+        region_batches = [
+            RegionBatch(
+                (rows, cols),
+                self._get_blend_masks(
+                    max(0, rows.stop - rows.start),
+                    max(0, cols.stop - cols.start),
+                    self.FEATHER_SIZE
+                ),
+                PIPELINE_BATCH
+            )
+            for rows, cols in region_slices
+        ]
 
-                finally:
-                    cap.release()
-                    out.release()
+        def blur_batch(frames: List[np.ndarray], position_idx: int):
+            region_batches[position_idx].apply(frames, self._blur_roi)
 
-            self._merge_audio(temp_video, self.input_path, self.output_path)
+        self._gpu_blur = create_cuda_blur(self.blur_intensity)
 
+        try:
+            run_frame_pipeline(
+                cap,
+                out,
+                schedule[frame_start:frame_end].tolist(),
+                blur_batch,
+                (metadata.height, metadata.width, 3),
+                progress_callback
+            )
         finally:
-            if os.path.exists(temp_video):
-                os.remove(temp_video)
+            self._gpu_blur = None
+            cap.release()
+            out.release()
+
+    def _filter_threads(self) -> int:
+        """
+        Size OpenCV's thread pool for the blur filters.
+
+        One core is left for the decode and encode threads, and the rest are
+        shared between segment workers. Multithreaded filters need an OpenCV
+        build with a parallel framework (TBB or OpenMP); see
+        cv2.getBuildInformation().
+
+        Returns:
+            Number of OpenCV threads to use in this process
+        """
+        available = max(1, (os.cpu_count() or 1) - 1)
+        return max(1, available // self.workers)
+
+    def _frame_limit(self, metadata: VideoMetadata) -> int:
+        """
+        Compute the number of frames to process from the start of the video.
+
+        Args:
+            metadata: Video metadata
+
+        Returns:
+            Total frame count, truncated to the preview duration if set
+        """
+        total_frames = metadata.total_frames
+        if self.preview_duration:
+            total_frames = min(
+                total_frames,
+                int(self.preview_duration * metadata.fps)
+            )
+        return total_frames
 
     def _merge_audio(self, video_file: str, audio_source: str, output_file: str):
         """
         Merge audio from source video with processed video using FFmpeg.
 
-        Uses high-quality H.264 encoding with CRF 18 for near-lossless quality.
+        The processed video stream is copied as-is when it is already H.264.
+        Otherwise, such as when OpenCV fell back to MPEG-4 Part 2, or when
+        re-encoding is enabled, it is encoded with NVENC if available, else
+        libx264 at CRF 18 with the veryfast preset.
 
         Args:
             video_file: Path to processed video (no audio)
             audio_source: Path to original video (with audio)
             output_file: Path to final output video
         """
+        if self.reencode or probe_video_codec(video_file) != 'h264':
+            video_args = h264_encoder_args()
+        else:
+            video_args = ['-c:v', 'copy']
+
         ffmpeg_cmd = [
             'ffmpeg', '-y',
             '-i', video_file,
             '-i', audio_source,
             '-map', '0:v:0',
             '-map', '1:a:0?',
-            '-c:v', 'libx264',
-            '-crf', '18',
-            '-preset', 'slow',
+            *video_args,
             '-c:a', 'aac',
             '-b:a', '320k',
             '-shortest',
@@ -165,87 +287,58 @@ class WatermarkProcessor:
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"FFmpeg audio merge failed: {e.stderr}")
 
-    def _apply_blur_to_region(
-        self,
-        frame: np.ndarray,
-        position: WatermarkPosition
-    ) -> np.ndarray:
+    def _blur_roi(self, roi: np.ndarray) -> np.ndarray:
         """
-        Apply Gaussian blur to a specific region of the frame.
+        Apply Gaussian blur to a watermark region.
 
-        Uses a smooth transition at edges for better blending.
+        Large kernels use cascaded box filters, whose cost does not grow with
+        the radius, to approximate the Gaussian.
 
         Args:
-            frame: Input video frame
-            position: Watermark position defining the region to blur
+            roi: Watermark region pixels
 
         Returns:
-            Frame with blurred watermark region
+            Blurred copy of the region
         """
-        result = frame.copy()
-
-        x, y = position.x, position.y
-        w, h = position.width, position.height
-
-        y_end = min(y + h, frame.shape[0])
-        x_end = min(x + w, frame.shape[1])
-
-        if y_end <= y or x_end <= x:
-            return result
-
-        roi = frame[y:y_end, x:x_end]
-
-        blurred_roi = cv2.GaussianBlur(
-            roi,
-            (self.blur_intensity, self.blur_intensity),
-            0
-        )
-
-        mask = self._create_feathered_mask(
-            roi.shape[1],
-            roi.shape[0],
-            feather_size=10
-        )
+        if self._gpu_blur is not None:
+            return self._gpu_blur.blur(roi)
 
-        for c in range(3):
-            result[y:y_end, x:x_end, c] = (
-                blurred_roi[:, :, c] * mask +
-                roi[:, :, c] * (1 - mask)
-            )
+        if self.blur_intensity >= self.BOX_BLUR_MIN_KERNEL:
+            blurred_roi = roi
+            for _ in range(self.BOX_BLUR_PASSES):
+                blurred_roi = cv2.blur(blurred_roi, (self.box_width, self.box_width))
+            return blurred_roi
 
-        return result
+        return cv2.GaussianBlur(roi, (self.blur_intensity, self.blur_intensity), 0)
 
-    def _create_feathered_mask(
+    def _get_blend_masks(
         self,
-        width: int,
         height: int,
-        feather_size: int = 10
-    ) -> np.ndarray:
+        width: int,
+        feather_size: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Create a feathered mask for smooth blending at region edges.
+        Return cached broadcastable blend masks for a region size.
 
-        The mask has values from 0 (no blur) at edges to 1 (full blur) at center.
+        Watermark regions keep a fixed size for the whole video, so each
+        mask pair is built once and reused for every frame.
 
         Args:
-            width: Mask width in pixels
-            height: Mask height in pixels
+            height: Region height in pixels
+            width: Region width in pixels
             feather_size: Size of the feathering transition in pixels
 
         Returns:
-            2D numpy array with values between 0 and 1
+            Tuple of (mask, complement) arrays of shape (height, width, 1)
         """
-        mask = np.ones((height, width), dtype=np.float32)
-
-        for i in range(feather_size):
-            alpha = i / feather_size
+        key = (height, width, feather_size)
+        masks = self._mask_cache.get(key)
 
-            if i < height and i < width:
-                mask[i, :] *= alpha
-                mask[-(i+1), :] *= alpha
-                mask[:, i] *= alpha
-                mask[:, -(i+1)] *= alpha
+        if masks is None:
+            masks = create_blend_masks(height, width, feather_size)
+            self._mask_cache[key] = masks
 
-        return mask
+        return masks
 
 
 class AdvancedWatermarkProcessor(WatermarkProcessor):
@@ -255,33 +348,23 @@ class AdvancedWatermarkProcessor(WatermarkProcessor):
     Uses bilateral filtering to preserve edges while blurring watermarks.
     """
 
-    def _apply_blur_to_region(
-        self,
-        frame: np.ndarray,
-        position: WatermarkPosition
-    ) -> np.ndarray:
+    FEATHER_SIZE = 15
+
+    def _blur_roi(self, roi: np.ndarray) -> np.ndarray:
         """
-        Apply edge-aware bilateral blur to watermark region.
+        Apply edge-aware bilateral blur to a watermark region.
+
+        The two Gaussian passes that follow the bilateral filter are folded
+        into one pass with sigma scaled by sqrt(2).
 
         Args:
-            frame: Input video frame
-            position: Watermark position defining the region to blur
+            roi: Watermark region pixels
 
         Returns:
-            Frame with blurred watermark region
+            Blurred copy of the region
         """
-        result = frame.copy()
-
-        x, y = position.x, position.y
-        w, h = position.width, position.height
-
-        y_end = min(y + h, frame.shape[0])
-        x_end = min(x + w, frame.shape[1])
-
-        if y_end <= y or x_end <= x:
-            return result
-
-        roi = frame[y:y_end, x:x_end]
+        if self._gpu_blur is not None:
+            return self._gpu_blur.blur(roi, passes=2, bilateral=True)
 
         blurred_roi = cv2.bilateralFilter(
             roi,
@@ -290,23 +373,8 @@ class AdvancedWatermarkProcessor(WatermarkProcessor):
             sigmaSpace=75
         )
 
-        for _ in range(2):
-            blurred_roi = cv2.GaussianBlur(
-                blurred_roi,
-                (self.blur_intensity, self.blur_intensity),
-                0
-            )
-
-        mask = self._create_feathered_mask(
-            roi.shape[1],
-            roi.shape[0],
-            feather_size=15
+        return cv2.GaussianBlur(
+            blurred_roi,
+            (0, 0),
+            sigmaX=self.blur_sigma * math.sqrt(2)
         )
-
-        for c in range(3):
-            result[y:y_end, x:x_end, c] = (
-                blurred_roi[:, :, c] * mask +
-                roi[:, :, c] * (1 - mask)
-            )
-
-        return result